@@ -11,9 +11,71 @@ data on NEOs and close approaches extracted by `extract.load_neos` and
 
 You'll edit this file in Tasks 2 and 3.
 """
-from typing import Generator
+import datetime
+import itertools
+import operator
+import pickle
+import sys
+from collections import defaultdict
+from functools import lru_cache
+from typing import Iterable, Iterator
 from models import NearEarthObject, CloseApproach
-from filters import AttributeFilter
+from filters import AttributeFilter, compile_predicate, declared_attribute, uses_default_call
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+    _COMPARISON_UFUNCS = {}
+else:
+    # NumPy equivalents of the comparators used by filters, which can write into a preallocated array.
+    _COMPARISON_UFUNCS = {
+        operator.eq: np.equal, operator.ne: np.not_equal,
+        operator.lt: np.less, operator.le: np.less_equal,
+        operator.gt: np.greater, operator.ge: np.greater_equal,
+    }
+
+
+@lru_cache(maxsize=1024)
+def _normalize(key: str) -> str:
+    """Normalize a designation or name into the form used by the lookup tables.
+
+    Interactive sessions tend to look up the same keys repeatedly, so the
+    results are cached. They are also interned, like the keys of the lookup
+    tables, so a hit compares by identity.
+
+    :param key: A designation or name, as supplied by the user.
+    :return: The key without surrounding whitespace, in lower case.
+    """
+    return sys.intern(key.strip().lower())
+
+
+# Version of the layout written by `NEODatabase.save`, covering the file's header
+# and the pickled state of the database, `NearEarthObject`, and `CloseApproach`.
+# Bump it whenever any of them changes, so that older pickles are recognized as stale.
+PICKLE_FORMAT = 2
+
+
+class StaleDatabaseError(ValueError):
+    """A pickled database was written in a different format, or from different sources, than expected."""
+
+
+# The exact type of reference value that each column can be compared against
+# with the same result as the filter's own comparison. Any other value - say, a
+# string, or a `datetime` compared to dates - is left to the filter itself.
+_COLUMN_TYPES = {
+    'date': datetime.date, 'distance': float, 'velocity': float,
+    'diameter': float, 'hazardous': bool,
+}
+
+
+def _filter_cost(filter) -> int:
+    """Return the relative cost of applying a filter, for ordering filters.
+
+    :param filter: A filter on a `CloseApproach`.
+    :return: Its `cost`, or the default cost of an `AttributeFilter` if it has none.
+    """
+    return getattr(filter, 'cost', AttributeFilter.cost)
 
 
 class NEODatabase:
@@ -46,28 +108,150 @@ class NEODatabase:
         self._neos = neos
         self._approaches = approaches
 
-        # Create a lookup table using NEO's designation as key and the index of a NEO in a list as value.
-        self._designation_to_index: dict[str, int] = {}
-
-        for i, neo in enumerate(self._neos):
-            self._designation_to_index[neo.designation] = i
-
+        # Bucket the approaches by their NEO's designation in a single pass.
+        buckets: defaultdict[str, list[CloseApproach]] = defaultdict(list)
         for approach in self._approaches:
-            if approach.neo is None:
-                if approach._designation in self._designation_to_index:
-                    # Get a neo by getting an index in the lookup table above through the approach's designation and pass it to the _neos list.
-                    approach.neo = self._neos[self._designation_to_index[approach._designation]]
-                    # Append the approach above to the neo's approaches' list.
-                    approach.neo.approaches.append(approach)
+            buckets[approach._designation].append(approach)
 
         # Auxiliary data structures to help speed up the inspect and query time.
-        self._designation_to_neo = {
-            neo.designation.lower(): neo for neo in self._neos
-        }
-        self._name_to_neo = {
-            neo.name.lower(): neo for neo in self._neos if neo.name is not None
+        self._designation_to_neo: dict[str, NearEarthObject] = {}
+        self._name_to_neo: dict[str, NearEarthObject] = {}
+
+        # In a single pass over the NEOs, fill the lookup tables, hand each NEO
+        # its bucket of approaches, and point those approaches back at it.
+        designation_to_neo = self._designation_to_neo
+        name_to_neo = self._name_to_neo
+        buckets_get = buckets.get
+        for neo in self._neos:
+            designation = neo.designation
+            designation_to_neo[sys.intern(designation.lower())] = neo
+            if neo.name is not None:
+                name_to_neo[sys.intern(neo.name.lower())] = neo
+
+            neo_approaches = buckets_get(designation)
+            if neo_approaches:
+                neo.approaches = neo_approaches
+                for approach in neo_approaches:
+                    approach.neo = neo
+
+        # Columnar copies of the filterable attributes of every approach, so that
+        # `query` can evaluate a filter over all approaches at once. Only built
+        # when NumPy is available.
+        self._columns = self._build_columns() if np is not None else None
+
+    def __setstate__(self, state: dict) -> None:
+        """Restore a database unpickled by `NEODatabase.load`.
+
+        Unpickled strings aren't interned, so the keys of the lookup tables are
+        interned again. The columns are rebuilt if the database was pickled
+        without NumPy but NumPy is available now.
+
+        :param state: The pickled `__dict__` of the database.
+        """
+        self.__dict__.update(state)
+        self._designation_to_neo = {sys.intern(key): neo for key, neo in self._designation_to_neo.items()}
+        self._name_to_neo = {sys.intern(key): neo for key, neo in self._name_to_neo.items()}
+        if self._columns is None and np is not None:
+            self._columns = self._build_columns()
+
+    def save(self, path, sources=None) -> None:
+        """Pickle this database, including its links and auxiliary data structures, to a file.
+
+        :param path: A Path-like object pointing to where the database should be saved.
+        :param sources: A picklable description of the data the database was built from, checked by `load`.
+        """
+        with open(path, 'wb') as f:
+            # Lead with the format version and the sources, so `load` can check
+            # them before unpickling anything else.
+            pickle.dump(PICKLE_FORMAT, f, protocol=5)
+            pickle.dump(sources, f, protocol=5)
+            pickle.dump(self, f, protocol=5)
+
+    @classmethod
+    def load(cls, path, sources=None) -> 'NEODatabase':
+        """Load a database previously pickled to a file with `save`.
+
+        Only load files written by `save` - unpickling can run arbitrary code.
+
+        :param path: A Path-like object pointing to a pickled `NEODatabase`.
+        :param sources: If not None, the `sources` that the database must have been saved with.
+        :return: The unpickled `NEODatabase`.
+        :raises StaleDatabaseError: If the file was saved in another `PICKLE_FORMAT`, or from other sources.
+        """
+        with open(path, 'rb') as f:
+            if pickle.load(f) != PICKLE_FORMAT:
+                raise StaleDatabaseError(f"{path} holds a database pickled in another format.")
+            saved_sources = pickle.load(f)
+            if sources is not None and saved_sources != sources:
+                raise StaleDatabaseError(f"{path} holds a database built from other sources.")
+            database = pickle.load(f)
+
+        if not isinstance(database, cls):
+            raise TypeError(f"{path} doesn't hold a pickled {cls.__name__}.")
+        return database
+
+    def _build_columns(self) -> dict[str, 'np.ndarray']:
+        """Build one NumPy array per filterable attribute, indexed like `self._approaches`.
+
+        The keys match the `column` attribute of the `AttributeFilter` subclasses.
+
+        :return: A dictionary mapping column names to arrays of attribute values.
+        """
+        approaches = self._approaches
+        count = len(approaches)
+        nan = float('nan')
+        return {
+            'date': np.array([approach.time.date() for approach in approaches], dtype='datetime64[D]'),
+            'distance': np.fromiter((approach.distance for approach in approaches),
+                                    dtype=np.float64, count=count),
+            'velocity': np.fromiter((approach.velocity for approach in approaches),
+                                    dtype=np.float64, count=count),
+            'diameter': np.fromiter((nan if approach.neo is None else approach.neo.diameter
+                                     for approach in approaches),
+                                    dtype=np.float64, count=count),
+            'hazardous': np.fromiter((approach.neo is not None and approach.neo.hazardous
+                                      for approach in approaches),
+                                     dtype=np.bool_, count=count),
         }
 
+    def _mask_for(self, filters: tuple[AttributeFilter, ...]) -> tuple['np.ndarray | None', list[AttributeFilter]]:
+        """Evaluate as many filters as possible over the columns at once.
+
+        Each filter whose `column` is known, whose comparator is one of the
+        standard comparisons, whose reference value has the column's type, and
+        which doesn't override `__call__`, is applied to the whole column, and the resulting
+        boolean arrays are ANDed together. Any other filter is returned so that
+        the caller can apply it one approach at a time.
+
+        :param filters: A collection of filters capturing user-specified criteria.
+        :return: The combined boolean mask (or `None` if no filter had a column) and the remaining filters.
+        """
+        mask = None
+        scratch = None
+        remaining = []
+        for filter in filters:
+            name = declared_attribute(filter, 'column') if uses_default_call(filter) else None
+            column = self._columns.get(name)
+            ufunc = _COMPARISON_UFUNCS.get(filter.op) if column is not None else None
+            if ufunc is None or type(filter.value) is not _COLUMN_TYPES[name]:
+                remaining.append(filter)
+                continue
+
+            # Convert the reference value to the column's dtype up front, so that
+            # NumPy doesn't fall back to comparing Python objects.
+            value = np.asarray(filter.value, dtype=column.dtype)
+            if mask is None:
+                mask = ufunc(column, value)
+                continue
+
+            # Reuse one scratch array for every further comparison, rather than
+            # allocating a temporary per filter.
+            if scratch is None:
+                scratch = np.empty_like(mask)
+            ufunc(column, value, out=scratch)
+            mask &= scratch
+        return mask, remaining
+
     def get_neo_by_designation(self, designation: str) -> NearEarthObject | None:
         """Find and return an NEO by its primary designation.
 
@@ -81,7 +265,7 @@ class NEODatabase:
         :param designation: The primary designation of the NEO to search for.
         :return: The `NearEarthObject` with the desired primary designation, or `None`.
         """
-        return self._designation_to_neo.get(designation.strip().lower(), None)
+        return self._designation_to_neo.get(_normalize(designation), None)
 
     def get_neo_by_name(self, name: str) -> NearEarthObject | None:
         """Find and return an NEO by its name.
@@ -97,9 +281,54 @@ class NEODatabase:
         :param name: The name, as a string, of the NEO to search for.
         :return: The `NearEarthObject` with the desired name, or `None`.
         """
-        return self._name_to_neo.get(name.strip().lower(), None)
+        return self._name_to_neo.get(_normalize(name), None)
 
-    def query(self, filters: set[AttributeFilter] = ()) -> Generator[CloseApproach, CloseApproach, CloseApproach]:
+    def _narrow(self, filters: tuple[AttributeFilter, ...]) -> tuple[list[int] | None, tuple[AttributeFilter, ...]]:
+        """Narrow down the approaches that could match, using the columns where possible.
+
+        The filters that remain are ordered by increasing `cost` (the order of
+        filters with equal cost is kept), so that cheap filters short-circuit
+        expensive ones.
+
+        :param filters: A tuple of filters capturing user-specified criteria.
+        :return: The indices of the candidate approaches (or `None` for all of
+            them) and the filters that the candidates still have to pass.
+        :raises TypeError: If `filters` isn't a tuple.
+        """
+        if not isinstance(filters, tuple):
+            raise TypeError(f"Filters must be passed as a tuple, not as a {type(filters).__name__}.")
+        filters = tuple(sorted(filters, key=_filter_cost))
+        if self._columns is None or not filters:
+            return None, filters
+
+        mask, remaining = self._mask_for(filters)
+        if mask is None:
+            return None, tuple(remaining)
+        return np.flatnonzero(mask).tolist(), tuple(remaining)
+
+    def _select(self, indices: list[int]) -> list[CloseApproach]:
+        """Fetch the approaches at the given indices, in a single call where possible.
+
+        :param indices: Indices into the collection of close approaches.
+        :return: A list of the `CloseApproach`es at those indices.
+        """
+        if len(indices) < 2:
+            return [self._approaches[i] for i in indices]
+        return list(operator.itemgetter(*indices)(self._approaches))
+
+    @staticmethod
+    def _match(approaches: Iterable[CloseApproach], filters: tuple[AttributeFilter, ...]) -> Iterator[CloseApproach]:
+        """Lazily test approaches one at a time against the remaining filters.
+
+        :param approaches: The candidate `CloseApproach`es.
+        :param filters: The filters that the candidates still have to pass.
+        :return: An iterator of the candidates that match all of the filters.
+        """
+        if not filters:
+            return iter(approaches)
+        return filter(compile_predicate(filters), approaches)
+
+    def query_iter(self, filters: tuple[AttributeFilter, ...] = ()) -> Iterator[CloseApproach]:
         """Query close approaches to generate those that match a collection of filters.
 
         This generates a stream of `CloseApproach` objects that match all of the
@@ -107,27 +336,44 @@ class NEODatabase:
 
         If no arguments are provided, generate all known close approaches.
 
+        The filters must be a tuple. They are applied in order of increasing
+        `cost` - filters of equal cost in the order given.
+
         The `CloseApproach` objects are generated in internal order, which isn't
         guaranteed to be sorted meaningfully, although is often sorted by time.
 
-        :param filters: A collection of filters capturing user-specified criteria.
+        :param filters: A tuple of filters capturing user-specified criteria.
         :return: A stream of matching `CloseApproach` objects.
+        :raises TypeError: If `filters` isn't a tuple.
         """
-        for approach in self._approaches:
-            if len(filters) == 0:
-                yield approach
+        indices, filters = self._narrow(filters)
+        approaches = self._approaches if indices is None else self._select(indices)
+        return self._match(approaches, filters)
 
-            result = False
+    def query(self, filters: tuple[AttributeFilter, ...] = (), limit: int | None = None) -> list[CloseApproach]:
+        """Query close approaches to find those that match a collection of filters.
 
-            for filter in filters:
+        This is the same as `query_iter`, but collects (at most `limit`) matches
+        into a list. When the columns can evaluate every filter, the matches are
+        picked out directly by index, and those beyond the limit are never fetched.
 
-                if filter(approach):
-                    result = True
-                else:
-                    result = False
-                    break
+        If `limit` is 0 or None, don't limit the matches at all.
 
-            if result is False:
-                continue
-
-            yield approach
+        :param filters: A tuple of filters capturing user-specified criteria.
+        :param limit: The maximum number of matches to return.
+        :return: A list of matching `CloseApproach` objects, in internal order.
+        :raises TypeError: If `filters` isn't a tuple.
+        :raises ValueError: If `limit` is negative.
+        """
+        if limit is not None and limit < 0:
+            raise ValueError(f"The limit must be non-negative, not {limit}.")
+
+        limit = limit or None
+        indices, filters = self._narrow(filters)
+        if indices is None:
+            approaches = self._approaches
+        elif not filters:
+            return self._select(indices[:limit])
+        else:
+            approaches = self._select(indices)
+        return list(itertools.islice(self._match(approaches, filters), limit))
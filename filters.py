@@ -11,9 +11,14 @@ from a comparator (from the `operator` module), a reference value, and a class
 method `get` that subclasses can override to fetch an attribute of interest from
 the supplied `CloseApproach`.
 
+The `compile_predicate` function fuses a collection of filters into a single
+1-argument predicate, which the `query` method uses when it has to test close
+approaches one at a time.
+
 The `limit` function simply limits the maximum number of values produced by an
 iterator.
 """
+import functools
 import itertools
 import operator
 import datetime
@@ -39,8 +44,24 @@ class AttributeFilter:
 
     Concrete subclasses can override the `get` classmethod to provide custom
     behavior to fetch a desired attribute from the given `CloseApproach`.
+
+    Concrete subclasses can also set `column` to the name of the `NEODatabase`
+    column holding the same attribute, which lets the database evaluate the
+    filter over all approaches at once instead of calling it on each one. This
+    only happens for the comparators of the `operator` module.
+    Likewise, `expression` can be set to the source of a Python expression,
+    in terms of `approach`, equivalent to `get(approach)`, which lets
+    `compile_predicate` inline the filter.
+
+    Filters are applied to each approach in order of increasing `cost`, so a
+    cheap filter can rule an approach out before a more expensive one runs.
+    Subclasses should set it relative to the default of 1.
     """
 
+    column: str | None = None
+    expression: str | None = None
+    cost: int = 1
+
     def __init__(self, op, value):
         """Construct a new `AttributeFilter` from an binary predicate and a reference value.
 
@@ -82,6 +103,11 @@ class ApproachDateFilter(AttributeFilter):
         AttributeFilter (_type_): A general superclass for filters on comparable attributes.
     """
 
+    column = 'date'
+    expression = 'approach.time.date()'
+    # Extracting the date builds a new object per approach.
+    cost = 3
+
     @classmethod
     def get(cls, approach: CloseApproach) -> datetime:
         """Get the time attribute of an approach.
@@ -102,6 +128,9 @@ class ApproachDistanceFilter(AttributeFilter):
         AttributeFilter (_type_): A general superclass for filters on comparable attributes.
     """
 
+    column = 'distance'
+    expression = 'approach.distance'
+
     @classmethod
     def get(cls, approach: CloseApproach) -> float:
         """Get the distance attribute of an approach.
@@ -122,6 +151,11 @@ class NEODiameterFilter(AttributeFilter):
         AttributeFilter (_type_): A general superclass for filters on comparable attributes.
     """
 
+    column = 'diameter'
+    expression = 'approach.neo.diameter'
+    # Reaches through the approach's NEO.
+    cost = 2
+
     @classmethod
     def get(cls, approach: CloseApproach) -> float:
         """Get the diameter attribute of a NEO.
@@ -142,6 +176,9 @@ class ApproachVelocityFilter(AttributeFilter):
         AttributeFilter (_type_): A general superclass for filters on comparable attributes.
     """
 
+    column = 'velocity'
+    expression = 'approach.velocity'
+
     @classmethod
     def get(cls, approach: CloseApproach) -> float:
         """Get the velocity attribute of an approach.
@@ -162,6 +199,11 @@ class HazardousFilter(AttributeFilter):
         AttributeFilter (_type_): A general superclass for filters on comparable attributes.
     """
 
+    column = 'hazardous'
+    expression = 'approach.neo.hazardous'
+    # Reaches through the approach's NEO.
+    cost = 2
+
     @classmethod
     def get(cls, approach: CloseApproach) -> bool:
         """Get the hazardous attribute of an neo.
@@ -196,8 +238,8 @@ def create_filters(
     `hazardous=False`, not to be confused with `hazardous=None`).
 
     The return value must be compatible with the `query` method of `NEODatabase`
-    because the main module directly passes this result to that method. For now,
-    this can be thought of as a collection of `AttributeFilter`s.
+    because the main module directly passes this result to that method. It is a
+    tuple of `AttributeFilter`s.
 
     :param date: A `date` on which a matching `CloseApproach` occurs.
     :param start_date: A `date` on or after which a matching `CloseApproach` occurs.
@@ -209,64 +251,174 @@ def create_filters(
     :param diameter_min: A minimum diameter of the NEO of a matching `CloseApproach`.
     :param diameter_max: A maximum diameter of the NEO of a matching `CloseApproach`.
     :param hazardous: Whether the NEO of a matching `CloseApproach` is potentially hazardous.
-    :return: A collection of filters for use with `query`.
+    :return: A tuple of filters for use with `query`.
     """
-    filters = set()
+    filters = []
 
     if date:
-        filters.add(
+        filters.append(
             ApproachDateFilter(operator.eq, date)
         )
 
     if start_date:
-        filters.add(
+        filters.append(
             ApproachDateFilter(
                 operator.ge, start_date)
         )
 
     if end_date:
-        filters.add(
+        filters.append(
             ApproachDateFilter(operator.le, end_date)
         )
 
     if distance_min:
-        filters.add(
+        filters.append(
             ApproachDistanceFilter(operator.ge, float(distance_min))
         )
 
     if distance_max:
-        filters.add(
+        filters.append(
             ApproachDistanceFilter(operator.le, float(distance_max))
         )
 
     if velocity_min:
-        filters.add(
+        filters.append(
             ApproachVelocityFilter(operator.ge, float(velocity_min))
         )
 
     if velocity_max:
-        filters.add(
+        filters.append(
             ApproachVelocityFilter(operator.le, float(velocity_max))
         )
 
     if diameter_min:
-        filters.add(
+        filters.append(
             NEODiameterFilter(operator.ge, float(diameter_min))
         )
 
     if diameter_max:
-        filters.add(
+        filters.append(
             NEODiameterFilter(operator.le, float(diameter_max))
         )
 
     if hazardous is not None:
-        filters.add(
+        filters.append(
             HazardousFilter(
                 operator.eq,
                 hazardous)
         )
 
-    return filters
+    return tuple(filters)
+
+
+def uses_default_call(filter):
+    """Return whether a filter is an `AttributeFilter` evaluated by `AttributeFilter.__call__`.
+
+    Only such filters can be evaluated through their `column`, `expression`,
+    `op`, and `get` - a subclass that overrides `__call__` has to be called.
+
+    :param filter: A filter on a `CloseApproach`.
+    :return: Whether calling the filter means `op(get(approach), value)`.
+    """
+    return isinstance(filter, AttributeFilter) and type(filter).__call__ is AttributeFilter.__call__
+
+
+def declared_attribute(filter, name):
+    """Return a class attribute of a filter that describes its `get`, if it can be trusted.
+
+    Class attributes like `column` and `expression` describe the `get` of the
+    class that sets them. A subclass that overrides `get` without setting them
+    again would inherit a description of the wrong attribute, so in that case
+    (and for callables that don't set them at all) this returns None.
+
+    :param filter: A filter on a `CloseApproach`.
+    :param name: The name of the class attribute, such as `'column'`.
+    :return: The value of that attribute, or None.
+    """
+    mro = type(filter).__mro__
+    owner = next((cls for cls in mro if name in vars(cls)), None)
+    get_owner = next((cls for cls in mro if 'get' in vars(cls)), None)
+    if owner is None or get_owner is None or not issubclass(owner, get_owner):
+        return None
+    return vars(owner)[name]
+
+
+# Infix spellings of the comparators that `compile_predicate` can inline.
+_OPERATOR_SYMBOLS = {
+    operator.eq: '==', operator.ne: '!=',
+    operator.lt: '<', operator.le: '<=',
+    operator.gt: '>', operator.ge: '>=',
+}
+
+
+def _clause_shape(filter):
+    """Describe how `compile_predicate` should evaluate a single filter.
+
+    :param filter: A filter on a `CloseApproach`.
+    :return: `('inline', expression, symbol)` for a filter whose comparison can be
+        written out in full, `('bound',)` for an `AttributeFilter` whose `op` and
+        `get` are called directly, or `('call',)` for any other callable.
+    """
+    if not uses_default_call(filter):
+        return ('call',)
+
+    expression = declared_attribute(filter, 'expression')
+    symbol = _OPERATOR_SYMBOLS.get(filter.op)
+    if expression is None or symbol is None:
+        return ('bound',)
+    return ('inline', expression, symbol)
+
+
+@functools.lru_cache(maxsize=128)
+def _predicate_code(shape):
+    """Compile the source of a predicate for filters of a given shape.
+
+    The shape holds one entry from `_clause_shape` per filter. Only those class
+    level strings reach the source - the filters' comparators, getters, and
+    reference values are looked up by name when the predicate runs, so each
+    shape is compiled once and reused.
+
+    :param shape: A tuple of clause shapes, as produced by `_clause_shape`.
+    :return: A code object evaluating to a 1-argument predicate.
+    """
+    clauses = []
+    for i, (kind, *details) in enumerate(shape):
+        if kind == 'inline':
+            expression, symbol = details
+            clauses.append(f"({expression}) {symbol} _value{i}")
+        elif kind == 'bound':
+            clauses.append(f"_op{i}(_get{i}(approach), _value{i})")
+        else:
+            clauses.append(f"_filter{i}(approach)")
+    source = f"lambda approach: {' and '.join(clauses) or 'True'}"
+    return compile(source, '<predicate>', 'eval')
+
+
+def compile_predicate(filters):
+    """Fuse a collection of filters into a single predicate on a `CloseApproach`.
+
+    A filter that defines an `expression` and uses one of the standard
+    comparators is inlined into the predicate, which saves a few function calls
+    per filter per approach. Any other `AttributeFilter` has its `op` and `get`
+    bound into the predicate, bypassing `__call__`. Anything else is simply called.
+
+    :param filters: A collection of `AttributeFilter`s.
+    :return: A 1-argument callable that is true if a `CloseApproach` matches all of the filters.
+    """
+    filters = tuple(filters)
+    shape = tuple(_clause_shape(filter) for filter in filters)
+
+    namespace = {}
+    for i, (filter, (kind, *_)) in enumerate(zip(filters, shape)):
+        if kind == 'call':
+            namespace[f"_filter{i}"] = filter
+            continue
+
+        namespace[f"_value{i}"] = filter.value
+        if kind == 'bound':
+            namespace[f"_op{i}"] = filter.op
+            namespace[f"_get{i}"] = filter.get
+    return eval(_predicate_code(shape), namespace)
 
 
 def limit(iterator: Generator, n=None):
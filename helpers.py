@@ -14,6 +14,12 @@ import datetime
 import os
 import pathlib
 
+# The English locale's abbreviated month names, as used by NASA's calendar dates.
+_MONTHS = {
+    'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
+    'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12,
+}
+
 
 def cd_to_datetime(calendar_date):
     """Convert a NASA-formatted calendar date/time description into a datetime.
@@ -28,6 +34,18 @@ def cd_to_datetime(calendar_date):
     :param calendar_date: A calendar date in YYYY-bb-DD hh:mm format.
     :return: A naive `datetime` corresponding to the given calendar date and time.
     """
+    # `strptime` is slow, and this runs once per close approach. NASA's dates are
+    # fixed-width, so slice out the fields directly and only fall back to
+    # `strptime` (and its error reporting) for anything unexpected.
+    month = _MONTHS.get(calendar_date[5:8])
+    year, day, hour, minute = calendar_date[0:4], calendar_date[9:11], calendar_date[12:14], calendar_date[15:17]
+    if (month is not None and len(calendar_date) == 17 and calendar_date[4] == calendar_date[8] == '-'
+            and calendar_date[11] == ' ' and calendar_date[14] == ':'
+            and (year + day + hour + minute).isdigit()):
+        try:
+            return datetime.datetime(int(year), month, int(day), int(hour), int(minute))
+        except ValueError:
+            pass
     return datetime.datetime.strptime(calendar_date, "%Y-%b-%d %H:%M")
 
 
@@ -35,18 +35,22 @@ having to wait to reload the database each time. However, it doesn't hot-reload.
 
 If needed, the script can load data from data files other than the default with
 `--neofile` or `--cadfile`.
+
+Building the database is slow, so the script pickles it next to the close
+approach data file and reuses that copy until either data file changes.
 """
 import argparse
 import cmd
 import datetime
 import pathlib
+import pickle
 import shlex
 import sys
 import time
 
 from extract import load_neos, load_approaches
 from database import NEODatabase
-from filters import create_filters, limit
+from filters import create_filters
 from write import write_to_csv, write_to_json
 
 
@@ -74,6 +78,75 @@ def date_fromisoformat(date_string):
             f"'{date_string}' is not a valid date. Use YYYY-MM-DD.")
 
 
+def nonnegative_int(string):
+    """Return the non-negative integer represented by a string.
+
+    :param string: A base-10 integer, such as '5'.
+    :return: The corresponding `int`.
+    """
+    try:
+        value = int(string)
+    except ValueError:
+        value = -1
+    if value < 0:
+        raise argparse.ArgumentTypeError(
+            f"'{string}' is not a valid limit. Use a non-negative integer.")
+    return value
+
+
+def cache_path(neofile, cadfile):
+    """Return the path of the cached database built from the given data files.
+
+    :param neofile: A Path to a CSV file of near-Earth objects.
+    :param cadfile: A Path to a JSON file of close approach data.
+    :return: A Path, next to `cadfile`, for the pickled `NEODatabase`.
+    """
+    return cadfile.with_name(f"{neofile.stem}-{cadfile.stem}.pickle")
+
+
+def source_stamps(*paths):
+    """Identify the current contents of data files, for checking a cached database against them.
+
+    :param paths: Paths to data files.
+    :return: A tuple of the resolved path, size, and modification time of each file.
+    """
+    stamps = []
+    for path in paths:
+        path = pathlib.Path(path).resolve()
+        stat = path.stat()
+        stamps.append((str(path), stat.st_size, stat.st_mtime_ns))
+    return tuple(stamps)
+
+
+def load_database(neofile, cadfile):
+    """Create an `NEODatabase` from the data files, reusing a cached copy if it's fresh.
+
+    The cached copy is used only if it was pickled in the current format from
+    these very data files, as they are now - the same resolved paths, sizes, and
+    modification times. Otherwise (or if it can't be read), the database is
+    rebuilt from the data files and the cache is refreshed.
+
+    :param neofile: A Path to a CSV file of near-Earth objects.
+    :param cadfile: A Path to a JSON file of close approach data.
+    :return: An `NEODatabase` of the NEOs and close approaches in the data files.
+    """
+    cachefile = cache_path(neofile, cadfile)
+    sources = source_stamps(neofile, cadfile)
+    try:
+        return NEODatabase.load(cachefile, sources)
+    except (OSError, pickle.UnpicklingError, EOFError, ImportError, AttributeError, TypeError, ValueError):
+        # A missing, stale, outdated, or unreadable cache - fall through and rebuild it.
+        pass
+
+    # Extract data from the data files into structured Python objects.
+    database = NEODatabase(load_neos(neofile), load_approaches(cadfile))
+    try:
+        database.save(cachefile, sources)
+    except OSError as err:
+        print(f"Unable to cache the database at {cachefile}: {err}", file=sys.stderr)
+    return database
+
+
 def make_parser():
     """Create an ArgumentParser for this script.
 
@@ -145,7 +218,7 @@ def make_parser():
     filters.add_argument('--not-hazardous', dest='hazardous', default=None, action='store_false',
                          help="If specified, only return close approaches of NEOs that "
                               "are not potentially hazardous.")
-    query.add_argument('-l', '--limit', type=int,
+    query.add_argument('-l', '--limit', type=nonnegative_int,
                        help="The maximum number of matches to return. "
                             "Defaults to 10 if no --outfile is given.")
     query.add_argument('-o', '--outfile', type=pathlib.Path,
@@ -220,18 +293,16 @@ def query(database, args):
     )
 
     # Query the database with the collection of filters.
-    results = database.query(filters)
-
     if not args.outfile:
         # Write the results to stdout, limiting to 10 entries if not specified.
-        for result in limit(results, args.limit or 10):
+        for result in database.query(filters, limit=args.limit or 10):
             print(result)
     else:
         # Write the results to a file.
         if args.outfile.suffix == '.csv':
-            write_to_csv(limit(results, args.limit), args.outfile)
+            write_to_csv(database.query(filters, limit=args.limit), args.outfile)
         elif args.outfile.suffix == '.json':
-            write_to_json(limit(results, args.limit), args.outfile)
+            write_to_json(database.query(filters, limit=args.limit), args.outfile)
         else:
             print(
                 "Please use an output file that ends with `.csv` or `.json`.", file=sys.stderr)
@@ -368,9 +439,9 @@ class NEOShell(cmd.Cmd):
         changed = [f for f in PROJECT_ROOT.glob(
             '*.py') if f.stat().st_mtime > _START]
         if changed:
+            names = ', '.join(str(f.relative_to(PROJECT_ROOT)) for f in changed)
             print("The following file(s) have been modified since this interactive session began: "
-                  f"{', '.join(str(f.relative_to(PROJECT_ROOT))
-                               for f in changed)}.",
+                  f"{names}.",
                   file=sys.stderr)
             if not self.aggressive:
                 print("To include these changes, please exit and restart this interactive session.",
@@ -387,9 +458,7 @@ def main():
     parser, inspect_parser, query_parser = make_parser()
     args = parser.parse_args()
 
-    # Extract data from the data files into structured Python objects.
-    database = NEODatabase(load_neos(args.neofile),
-                           load_approaches(args.cadfile))
+    database = load_database(args.neofile, args.cadfile)
 
     # Run the chosen subcommand.
     if args.cmd == 'inspect':
@@ -27,10 +27,13 @@ class NearEarthObject:
     potentially hazardous to Earth.
 
     A `NearEarthObject` also maintains a collection of its close approaches -
-    initialized to an empty collection, but eventually populated in the
-    `NEODatabase` constructor.
+    initialized to an empty collection, but eventually replaced in the
+    `NEODatabase` constructor by a list already holding all of them.
     """
 
+    # Skip the per-instance `__dict__` - the data set holds many thousands of NEOs.
+    __slots__ = ('designation', 'name', 'diameter', 'hazardous', 'approaches')
+
     def __init__(self, designation: str, name: str, diameter: str, hazardous: bool = False, close_approaches: list = None):
         """Create a new `NearEarthObject`.
 
@@ -39,17 +42,27 @@ class NearEarthObject:
             name (str, optional): IAU name. Defaults to None.
             diameter (float, optional): Diameter in kilometers - sometimes unknown. Defaults to float('nan').
             hazardous (bool, optional): Potentially hazardous to Earth. Defaults to False.
-            close_approaches (list, optional): A list of close approaches to Earth by this NEO. Defaults to {}.
+            close_approaches (list, optional): A list of close approaches to Earth by this NEO. Defaults to [].
         """
         self.designation = designation
         self.name = None if name == '' else name
         self.diameter = float('nan') if diameter == '' else float(diameter)
         self.hazardous = hazardous
 
-        # Create an empty initial collection of linked approaches.
+        # Create an empty initial collection of linked approaches. `NEODatabase`
+        # swaps in a fully built list, so nothing appends to this one.
         self.approaches: list[CloseApproach] = [
         ] if close_approaches is None else close_approaches
 
+    def __getstate__(self):
+        """Return the state of this NEO for pickling, as a compact tuple."""
+        # Bump `database.PICKLE_FORMAT` whenever this layout changes.
+        return (self.designation, self.name, self.diameter, self.hazardous, self.approaches)
+
+    def __setstate__(self, state):
+        """Restore the state of this NEO from `__getstate__`."""
+        self.designation, self.name, self.diameter, self.hazardous, self.approaches = state
+
     @property
     def fullname(self):
         """Return a representation of the full name of this NEO."""
@@ -94,6 +107,9 @@ class CloseApproach:
     `NEODatabase` constructor.
     """
 
+    # Skip the per-instance `__dict__` - the data set holds hundreds of thousands of approaches.
+    __slots__ = ('_designation', 'time', 'distance', 'velocity', 'neo')
+
     def __init__(self, time: str, distance: str, velocity: str, neo: NearEarthObject = None, designation: str = None) -> None:
         """Create a new `CloseApproach`.
 
@@ -111,6 +127,15 @@ class CloseApproach:
 
         self.neo = neo
 
+    def __getstate__(self):
+        """Return the state of this close approach for pickling, as a compact tuple."""
+        # Bump `database.PICKLE_FORMAT` whenever this layout changes.
+        return (self._designation, self.time, self.distance, self.velocity, self.neo)
+
+    def __setstate__(self, state):
+        """Restore the state of this close approach from `__getstate__`."""
+        self._designation, self.time, self.distance, self.velocity, self.neo = state
+
     @property
     def time_str(self) -> str:
         """Return a formatted representation of this `CloseApproach`'s approach time.
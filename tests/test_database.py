@@ -10,13 +10,20 @@ To run these tests from the project root, run:
 
 These tests should pass when Task 2 is complete.
 """
+import os
 import pathlib
+import pickle
 import math
+import shutil
+import sys
+import tempfile
 import unittest
+import unittest.mock
 
 
 from extract import load_neos, load_approaches
-from database import NEODatabase
+from database import NEODatabase, StaleDatabaseError
+import main
 
 
 # Paths to the test data files.
@@ -115,5 +122,129 @@ class TestDatabase(unittest.TestCase):
         self.assertIsNone(nonexistent)
 
 
+class TestDatabaseCache(unittest.TestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.root = pathlib.Path(tmpdir.name)
+
+        # Copy the data files, so that the cache is written next to them in the temporary directory.
+        self.neofile = pathlib.Path(shutil.copy2(TEST_NEO_FILE, self.root))
+        self.cadfile = pathlib.Path(shutil.copy2(TEST_CAD_FILE, self.root))
+        self.cachefile = main.cache_path(self.neofile, self.cadfile)
+
+    def touch(self, path, offset):
+        """Set the modification time of a file to `offset` seconds after the cache's."""
+        mtime = self.cachefile.stat().st_mtime + offset
+        os.utime(path, (mtime, mtime))
+
+    def test_save_and_load_round_trip(self):
+        db = NEODatabase(load_neos(self.neofile), load_approaches(self.cadfile))
+        db.save(self.cachefile)
+        loaded = NEODatabase.load(self.cachefile)
+
+        self.assertEqual(len(loaded._neos), len(db._neos))
+        self.assertEqual(len(loaded._approaches), len(db._approaches))
+        for approach in loaded._approaches:
+            self.assertIn(approach, approach.neo.approaches)
+        for neo in loaded._neos:
+            for approach in neo.approaches:
+                self.assertIs(approach.neo, neo)
+
+        jormungandr = loaded.get_neo_by_name('Jormungandr')
+        self.assertEqual((jormungandr.designation, jormungandr.name), ('471926', 'Jormungandr'))
+        self.assertIs(loaded.get_neo_by_designation('471926'), jormungandr)
+        self.assertEqual(
+            [(a.time, a.distance, a.velocity) for a in loaded.query()],
+            [(a.time, a.distance, a.velocity) for a in db.query()]
+        )
+
+    def test_load_reinterns_lookup_keys(self):
+        NEODatabase(load_neos(self.neofile), load_approaches(self.cadfile)).save(self.cachefile)
+        loaded = NEODatabase.load(self.cachefile)
+
+        for table in (loaded._designation_to_neo, loaded._name_to_neo):
+            self.assertGreater(len(table), 0)
+            for key in table:
+                self.assertIs(sys.intern(key), key)
+
+    def test_load_rejects_another_format(self):
+        db = NEODatabase(load_neos(self.neofile), load_approaches(self.cadfile))
+        with open(self.cachefile, 'wb') as f:
+            pickle.dump(db, f, protocol=5)
+
+        with self.assertRaises(StaleDatabaseError):
+            NEODatabase.load(self.cachefile)
+
+    def test_load_rejects_other_sources(self):
+        db = NEODatabase(load_neos(self.neofile), load_approaches(self.cadfile))
+        db.save(self.cachefile, sources=('a',))
+
+        self.assertIsInstance(NEODatabase.load(self.cachefile, sources=('a',)), NEODatabase)
+        self.assertIsInstance(NEODatabase.load(self.cachefile), NEODatabase)
+        with self.assertRaises(StaleDatabaseError):
+            NEODatabase.load(self.cachefile, sources=('b',))
+
+    def test_load_database_writes_then_reuses_cache(self):
+        self.assertFalse(self.cachefile.exists())
+        db = main.load_database(self.neofile, self.cadfile)
+        self.assertTrue(self.cachefile.exists())
+
+        with unittest.mock.patch('main.load_approaches') as mock_load:
+            cached = main.load_database(self.neofile, self.cadfile)
+        mock_load.assert_not_called()
+        self.assertEqual(len(cached._approaches), len(db._approaches))
+
+    def test_load_database_rebuilds_when_data_file_is_newer(self):
+        main.load_database(self.neofile, self.cadfile)
+        self.touch(self.cadfile, 10)
+
+        with unittest.mock.patch('main.load_approaches', wraps=load_approaches) as mock_load:
+            main.load_database(self.neofile, self.cadfile)
+        mock_load.assert_called_once()
+
+    def test_load_database_rebuilds_unreadable_cache(self):
+        for contents in (b'', b'not a pickle', pickle.dumps(0, protocol=5) + b'trailing'):
+            with self.subTest(contents=contents):
+                self.cachefile.write_bytes(contents)
+
+                with unittest.mock.patch('main.load_approaches', wraps=load_approaches) as mock_load:
+                    db = main.load_database(self.neofile, self.cadfile)
+                mock_load.assert_called_once()
+                self.assertIsNotNone(db.get_neo_by_name('Jormungandr'))
+
+    def test_load_database_rebuilds_cache_with_mismatched_layout(self):
+        main.load_database(self.neofile, self.cadfile)
+
+        # Simulate a cache written when the models pickled a different number of fields.
+        with unittest.mock.patch('models.CloseApproach.__setstate__', side_effect=ValueError):
+            with unittest.mock.patch('main.load_approaches', wraps=load_approaches) as mock_load:
+                main.load_database(self.neofile, self.cadfile)
+        mock_load.assert_called_once()
+
+
+    def test_load_database_tells_apart_data_files_with_the_same_name(self):
+        # A header-only NEO file in another directory shares its stem, and so its cache file.
+        (self.root / 'other').mkdir()
+        other_neofile = self.root / 'other' / self.neofile.name
+        with open(self.neofile) as f:
+            other_neofile.write_text(f.readline())
+        self.assertEqual(main.cache_path(other_neofile, self.cadfile), self.cachefile)
+
+        full = main.load_database(self.neofile, self.cadfile)
+        self.assertGreater(len(full._neos), 0)
+        self.touch(other_neofile, -10)
+
+        with unittest.mock.patch('main.load_approaches', wraps=load_approaches) as mock_load:
+            empty = main.load_database(other_neofile, self.cadfile)
+        mock_load.assert_called_once()
+        self.assertEqual(len(empty._neos), 0)
+
+        with unittest.mock.patch('main.load_approaches', wraps=load_approaches) as mock_load:
+            rebuilt = main.load_database(self.neofile, self.cadfile)
+        mock_load.assert_called_once()
+        self.assertEqual(len(rebuilt._neos), len(full._neos))
+
+
 if __name__ == '__main__':
     unittest.main()
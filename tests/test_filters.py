@@ -0,0 +1,114 @@
+"""Check that `compile_predicate` fuses filters into an equivalent predicate.
+
+Each filter is compiled into one of three clause shapes - inlined, with its
+`op` and `get` bound, or simply called - and the compiled code is cached per
+shape. Whatever the shape, the predicate must agree with applying every filter
+in turn.
+
+To run these tests from the project root, run:
+
+    $ python3 -m unittest --verbose tests.test_filters
+"""
+import datetime
+import math
+import operator
+import pathlib
+import unittest
+
+from database import NEODatabase
+from extract import load_neos, load_approaches
+from filters import (create_filters, compile_predicate, _clause_shape, _predicate_code,
+                     AttributeFilter, ApproachDistanceFilter, HazardousFilter)
+
+
+TESTS_ROOT = (pathlib.Path(__file__).parent).resolve()
+TEST_NEO_FILE = TESTS_ROOT / 'test-neos-2020.csv'
+TEST_CAD_FILE = TESTS_ROOT / 'test-cad-2020.json'
+
+
+class RoundedDistanceFilter(ApproachDistanceFilter):
+    """A distance filter whose `get` no longer matches its inherited `expression`."""
+
+    @classmethod
+    def get(cls, approach):
+        return round(approach.distance, 1)
+
+
+class NegatedHazardousFilter(HazardousFilter):
+    """A hazardous filter that overrides `__call__` itself."""
+
+    def __call__(self, approach):
+        return not super().__call__(approach)
+
+
+class TestCompilePredicate(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.approaches = load_approaches(TEST_CAD_FILE)
+        NEODatabase(load_neos(TEST_NEO_FILE), cls.approaches)
+
+    def assertPredicateMatchesFilters(self, filters):
+        predicate = compile_predicate(filters)
+        for approach in self.approaches:
+            self.assertEqual(bool(predicate(approach)), all(f(approach) for f in filters),
+                             msg=f"The compiled predicate disagrees with {filters} on {approach!r}.")
+
+    def test_inline_shape(self):
+        filters = create_filters(
+            start_date=datetime.date(2020, 3, 1), end_date=datetime.date(2020, 6, 30),
+            distance_max=0.4, velocity_min=10, diameter_min=0.1, hazardous=False
+        )
+        for f in filters:
+            self.assertEqual(_clause_shape(f)[0], 'inline')
+        self.assertPredicateMatchesFilters(filters)
+
+    def test_bound_shape(self):
+        filters = (
+            ApproachDistanceFilter(lambda value, reference: math.isclose(value, reference, rel_tol=0.5), 0.1),
+            RoundedDistanceFilter(operator.le, 0.2),
+        )
+        for f in filters:
+            self.assertEqual(_clause_shape(f), ('bound',))
+        self.assertPredicateMatchesFilters(filters)
+
+    def test_call_shape(self):
+        filters = (
+            lambda approach: approach.velocity > 10,
+            NegatedHazardousFilter(operator.eq, True),
+        )
+        for f in filters:
+            self.assertEqual(_clause_shape(f), ('call',))
+        self.assertPredicateMatchesFilters(filters)
+
+    def test_mixed_shapes(self):
+        filters = (
+            ApproachDistanceFilter(operator.le, 0.3),
+            RoundedDistanceFilter(operator.ge, 0.1),
+            lambda approach: approach.velocity > 10,
+        )
+        self.assertEqual([_clause_shape(f)[0] for f in filters], ['inline', 'bound', 'call'])
+        self.assertPredicateMatchesFilters(filters)
+
+    def test_no_filters_match_everything(self):
+        predicate = compile_predicate(())
+        self.assertTrue(all(predicate(approach) for approach in self.approaches))
+
+    def test_cached_code_is_reused_across_values(self):
+        _predicate_code.cache_clear()
+        near = compile_predicate((ApproachDistanceFilter(operator.le, 0.1),))
+        far = compile_predicate((ApproachDistanceFilter(operator.le, 0.4),))
+        self.assertEqual(_predicate_code.cache_info().misses, 1)
+        self.assertEqual(_predicate_code.cache_info().hits, 1)
+
+        for approach in self.approaches:
+            self.assertEqual(near(approach), approach.distance <= 0.1)
+            self.assertEqual(far(approach), approach.distance <= 0.4)
+
+    def test_attribute_filter_without_get_still_raises(self):
+        predicate = compile_predicate((AttributeFilter(operator.eq, 0),))
+        with self.assertRaises(NotImplementedError):
+            predicate(self.approaches[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+"""Check that `cd_to_datetime` converts NASA's calendar dates like `strptime`.
+
+NASA's dates are fixed-width, so `cd_to_datetime` slices out the fields
+directly and only falls back to `strptime` for anything else. Either way, the
+result (or the error) must match what `strptime` produces.
+
+To run these tests from the project root, run:
+
+    $ python3 -m unittest --verbose tests.test_helpers
+"""
+import datetime
+import unittest
+import unittest.mock
+
+from helpers import cd_to_datetime, datetime_to_str
+
+
+class TestCdToDatetime(unittest.TestCase):
+    def convert(self, calendar_date):
+        """Convert a calendar date, and also return whether it fell back to `strptime`."""
+        with unittest.mock.patch('helpers.datetime.datetime', wraps=datetime.datetime) as mock_datetime:
+            result = cd_to_datetime(calendar_date)
+        return result, mock_datetime.strptime.called
+
+    def test_normal_date(self):
+        result, fell_back = self.convert('2020-Dec-31 12:00')
+        self.assertEqual(result, datetime.datetime(2020, 12, 31, 12, 0))
+        self.assertIs(type(result), datetime.datetime)
+        self.assertFalse(fell_back)
+
+    def test_every_month(self):
+        for month in range(1, 13):
+            expected = datetime.datetime(1999, month, 9, 23, 59)
+            calendar_date = expected.strftime('%Y-%b-%d %H:%M')
+            with self.subTest(calendar_date=calendar_date):
+                self.assertEqual(cd_to_datetime(calendar_date), expected)
+
+    def test_lower_case_month_falls_back(self):
+        result, fell_back = self.convert('2020-jan-01 00:11')
+        self.assertEqual(result, datetime.datetime(2020, 1, 1, 0, 11))
+        self.assertTrue(fell_back)
+
+    def test_invalid_day_raises_from_strptime(self):
+        with unittest.mock.patch('helpers.datetime.datetime', wraps=datetime.datetime) as mock_datetime:
+            with self.assertRaises(ValueError):
+                cd_to_datetime('2020-Feb-30 00:00')
+        self.assertTrue(mock_datetime.strptime.called)
+
+    def test_non_padded_field_falls_back(self):
+        for calendar_date in ('2020-Jan-1 00:00', '2020-Jan-01 0:00'):
+            with self.subTest(calendar_date=calendar_date):
+                result, fell_back = self.convert(calendar_date)
+                self.assertEqual(result, datetime.datetime(2020, 1, 1, 0, 0))
+                self.assertTrue(fell_back)
+
+    def test_non_digit_field_raises(self):
+        for calendar_date in ('+020-Jan-01 00:00', '2020-Jan-01 0²:00'):
+            with self.subTest(calendar_date=calendar_date):
+                with self.assertRaises(ValueError):
+                    cd_to_datetime(calendar_date)
+
+    def test_round_trip_with_datetime_to_str(self):
+        self.assertEqual(datetime_to_str(cd_to_datetime('1900-Jan-01 00:11')), '1900-01-01 00:11')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -13,12 +13,16 @@ To run these tests from the project root, run::
 These tests should pass when Tasks 3a and 3b are complete.
 """
 import datetime
+import math
+import operator
 import pathlib
 import unittest
+import unittest.mock
 
 from database import NEODatabase
 from extract import load_neos, load_approaches
-from filters import create_filters
+from filters import (create_filters, ApproachDateFilter, ApproachDistanceFilter,
+                     ApproachVelocityFilter, HazardousFilter)
 
 
 TESTS_ROOT = (pathlib.Path(__file__).parent).resolve()
@@ -27,6 +31,35 @@ TEST_CAD_FILE = TESTS_ROOT / 'test-cad-2020.json'
 DO_NOT_MATCH = "Computed results do not match expected results."
 
 
+class RecordingFilter:
+    """A filter that matches everything, recording its name in a shared log when called."""
+
+    def __init__(self, name, log, cost=None):
+        self.name = name
+        self.log = log
+        if cost is not None:
+            self.cost = cost
+
+    def __call__(self, approach):
+        self.log.append(self.name)
+        return True
+
+
+class RoundedDistanceFilter(ApproachDistanceFilter):
+    """A distance filter whose `get` no longer matches its inherited `column` and `expression`."""
+
+    @classmethod
+    def get(cls, approach):
+        return round(approach.distance, 1)
+
+
+class NegatedHazardousFilter(HazardousFilter):
+    """A hazardous filter that overrides `__call__`, so its inherited `column` doesn't describe it."""
+
+    def __call__(self, approach):
+        return not super().__call__(approach)
+
+
 class TestQuery(unittest.TestCase):
     # Set longMessage to True to enable lengthy diffs between set comparisons.
     longMessage = False
@@ -536,6 +569,176 @@ class TestQuery(unittest.TestCase):
         received = set(self.db.query(filters))
         self.assertEqual(expected, received, msg=DO_NOT_MATCH)
 
+    ##################
+    # Custom filters #
+    ##################
+
+    def test_query_with_plain_callable(self):
+        expected = set(
+            approach for approach in self.approaches
+            if approach.distance < 0.1
+        )
+        self.assertGreater(len(expected), 0)
+
+        received = set(self.db.query((lambda approach: approach.distance < 0.1,)))
+        self.assertEqual(expected, received, msg=DO_NOT_MATCH)
+
+    def test_query_with_non_vectorizable_ops(self):
+        ops = (
+            (lambda value, reference: math.isclose(value, reference, rel_tol=0.5), 0.1),
+            (lambda value, range_: range_[0] <= value and value <= range_[1], (0.05, 0.1)),
+            (lambda value, reference: bool(reference), True),
+        )
+        for op, reference in ops:
+            with self.subTest(reference=reference):
+                distance_filter = ApproachDistanceFilter(op, reference)
+                expected = set(
+                    approach for approach in self.approaches
+                    if distance_filter(approach)
+                )
+                self.assertGreater(len(expected), 0)
+
+                received = set(self.db.query((distance_filter,)))
+                self.assertEqual(expected, received, msg=DO_NOT_MATCH)
+
+    def test_query_with_overridden_get(self):
+        expected = set(
+            approach for approach in self.approaches
+            if round(approach.distance, 1) == 0.1
+        )
+        self.assertGreater(len(expected), 0)
+
+        filters = (RoundedDistanceFilter(operator.eq, 0.1),)
+        received = set(self.db.query(filters))
+        self.assertEqual(expected, received, msg=DO_NOT_MATCH)
+
+    def test_query_with_overridden_get_without_columns(self):
+        expected = set(
+            approach for approach in self.approaches
+            if round(approach.distance, 1) == 0.1
+        )
+        self.assertGreater(len(expected), 0)
+
+        # Without NumPy, every filter is compiled into the per-approach predicate.
+        with unittest.mock.patch('database.np', None):
+            db = NEODatabase(load_neos(TEST_NEO_FILE), load_approaches(TEST_CAD_FILE))
+        approaches = {(a.time, a.neo.designation) for a in expected}
+
+        filters = (RoundedDistanceFilter(operator.eq, 0.1),)
+        received = {(a.time, a.neo.designation) for a in db.query(filters)}
+        self.assertEqual(approaches, received, msg=DO_NOT_MATCH)
+
+    def test_query_with_overridden_call(self):
+        expected = set(
+            approach for approach in self.approaches
+            if not approach.neo.hazardous
+        )
+        self.assertGreater(len(expected), 0)
+
+        filters = (NegatedHazardousFilter(operator.eq, True),)
+        received = set(self.db.query(filters))
+        self.assertEqual(expected, received, msg=DO_NOT_MATCH)
+
+    def test_query_with_differently_typed_values(self):
+        # Values of another type than the column's are compared by the filter itself.
+        velocity_filter = ApproachVelocityFilter(operator.gt, 10)
+        expected = set(
+            approach for approach in self.approaches
+            if approach.velocity > 10
+        )
+        self.assertGreater(len(expected), 0)
+        self.assertEqual(expected, set(self.db.query((velocity_filter,))), msg=DO_NOT_MATCH)
+
+        date_filter = ApproachDateFilter(operator.eq, datetime.datetime(2020, 1, 1))
+        self.assertEqual(self.db.query((date_filter,)), [])
+
+        distance_filter = ApproachDistanceFilter(operator.le, '0.1')
+        with self.assertRaises(TypeError):
+            distance_filter(self.approaches[0])
+        with self.assertRaises(TypeError):
+            self.db.query((distance_filter,))
+
+    #########################
+    # Limits and query_iter #
+    #########################
+
+    def test_query_returns_list(self):
+        filters = create_filters(distance_max=0.1)
+        self.assertIsInstance(self.db.query(filters), list)
+        self.assertIsInstance(self.db.query(), list)
+
+    def test_query_limit_with_column_filters(self):
+        filters = create_filters(distance_max=0.4, hazardous=False)
+        expected = [
+            approach for approach in self.approaches
+            if approach.distance <= 0.4 and not approach.neo.hazardous
+        ]
+        self.assertGreater(len(expected), 5)
+
+        self.assertEqual(self.db.query(filters, limit=5), expected[:5])
+        self.assertEqual(self.db.query(filters, limit=1), expected[:1])
+        self.assertEqual(self.db.query(filters, limit=len(expected) + 10), expected)
+        self.assertEqual(self.db.query(filters, limit=0), expected)
+        self.assertEqual(self.db.query(filters, limit=None), expected)
+
+    def test_query_limit_with_mixed_filters(self):
+        filters = create_filters(distance_max=0.4) + (lambda approach: approach.velocity > 10,)
+        expected = [
+            approach for approach in self.approaches
+            if approach.distance <= 0.4 and approach.velocity > 10
+        ]
+        self.assertGreater(len(expected), 5)
+
+        self.assertEqual(self.db.query(filters, limit=5), expected[:5])
+        self.assertEqual(self.db.query(filters, limit=0), expected)
+
+    def test_query_limit_without_filters(self):
+        self.assertEqual(self.db.query(limit=3), list(self.approaches[:3]))
+
+    def test_query_rejects_negative_limit(self):
+        for filters in (create_filters(distance_max=0.4),
+                        create_filters(distance_max=0.4) + (lambda approach: approach.velocity > 10,),
+                        ()):
+            with self.subTest(filters=filters):
+                with self.assertRaises(ValueError):
+                    self.db.query(filters, limit=-1)
+
+    def test_query_iter_matches_query(self):
+        for filters in (create_filters(),
+                        create_filters(distance_max=0.4, hazardous=False),
+                        create_filters(distance_max=0.4) + (lambda approach: approach.velocity > 10,),
+                        (lambda approach: approach.velocity > 10,)):
+            with self.subTest(filters=filters):
+                self.assertEqual(list(self.db.query_iter(filters)), self.db.query(filters))
+
+    ################
+    # Filter order #
+    ################
+
+    def test_query_applies_filters_in_stable_cost_order(self):
+        log = []
+        filters = (
+            RecordingFilter('expensive', log, cost=3),
+            RecordingFilter('first-default', log),
+            RecordingFilter('cheap', log, cost=0),
+            RecordingFilter('second-default', log, cost=1),
+        )
+        self.db.query(filters, limit=1)
+        self.assertEqual(log, ['cheap', 'first-default', 'second-default', 'expensive'])
+
+    def test_query_requires_tuple_of_filters(self):
+        filters = create_filters(distance_max=0.4)
+        for collection in (set(filters), list(filters)):
+            with self.subTest(collection=type(collection).__name__):
+                with self.assertRaises(TypeError):
+                    self.db.query(collection)
+                with self.assertRaises(TypeError):
+                    self.db.query_iter(collection)
+
+    def test_create_filters_returns_tuple(self):
+        self.assertIsInstance(create_filters(), tuple)
+        self.assertIsInstance(create_filters(distance_max=0.4, hazardous=True), tuple)
+
 
 if __name__ == '__main__':
     unittest.main()
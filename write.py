@@ -11,10 +11,34 @@ extension determines which of these functions is used.
 You'll edit this file in Part 4.
 """
 import csv
+import itertools
 import json
 import pathlib
 
-from models import CloseApproach, NearEarthObject
+from models import CloseApproach
+
+# Size, in bytes, of the output file buffers - large enough to batch many small row writes.
+BUFFER_SIZE = 1 << 20
+
+# Number of JSON entries joined together into each write.
+BATCH_SIZE = 4096
+
+# Encode a string as a quoted JSON string, escaped exactly as `json.dumps` does.
+_json_str = json.encoder.encode_basestring_ascii
+
+
+def _json_float(value: float) -> str:
+    """Encode a float as JSON, exactly as `json.dumps` does.
+
+    :param value: A float, possibly NaN or infinite.
+    :return: The JSON representation of the value.
+    """
+    # Subtracting a finite value from itself gives 0.0 - NaN and the infinities give NaN.
+    if value - value == 0:
+        return float.__repr__(value)
+    if value != value:
+        return 'NaN'
+    return 'Infinity' if value > 0 else '-Infinity'
 
 
 def write_to_csv(results: list[CloseApproach], filename: pathlib.Path) -> None:
@@ -31,12 +55,17 @@ def write_to_csv(results: list[CloseApproach], filename: pathlib.Path) -> None:
         'datetime_utc', 'distance_au', 'velocity_km_s',
         'designation', 'name', 'diameter_km', 'potentially_hazardous'
     )
-    with open(filename, 'w', encoding='utf-8', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
+    with open(filename, 'w', encoding='utf-8', newline='', buffering=BUFFER_SIZE) as f:
+        writer = csv.writer(f)
+        writer.writerow(fieldnames)
 
-        for result in results:
-            writer.writerow(result.serialize() | result.neo.serialize())
+        # Pull each row straight from the attributes, in the order of `fieldnames`.
+        writer.writerows(
+            (result.time_str, result.distance, result.velocity,
+             result.neo.designation, result.neo.name or '',
+             result.neo.diameter, result.neo.hazardous)
+            for result in results
+        )
 
 
 def write_to_json(results: list[CloseApproach], filename: pathlib.Path) -> None:
@@ -50,14 +79,24 @@ def write_to_json(results: list[CloseApproach], filename: pathlib.Path) -> None:
     :param results: An iterable of `CloseApproach` objects.
     :param filename: A Path-like object pointing to where the data should be saved.
     """
-    with open(filename, 'w', encoding='utf-8') as f:
-        dict_list: list[dict[str, str]] = [result.serialize() | nest_neo_object(result.neo)
-                                           for result in results]
-
-        json.dump(dict_list, f)
-
-
-def nest_neo_object(neo: NearEarthObject) -> dict[str, dict[str, str]]:
-    return {
-        'neo': neo.serialize()
-    }
+    with open(filename, 'w', encoding='utf-8', buffering=BUFFER_SIZE) as f:
+        # Every entry has the same keys, so only the values are encoded per row.
+        entries = (
+            f'{{"datetime_utc": {_json_str(result.time_str)}, '
+            f'"distance_au": {_json_float(result.distance)}, '
+            f'"velocity_km_s": {_json_float(result.velocity)}, '
+            f'"neo": {{"designation": {_json_str(result.neo.designation)}, '
+            f'"name": {_json_str(result.neo.name or "")}, '
+            f'"diameter_km": {_json_float(result.neo.diameter)}, '
+            f'"potentially_hazardous": {"true" if result.neo.hazardous else "false"}}}}}'
+            for result in results
+        )
+
+        # Stream the entries in batches instead of building the whole list first.
+        f.write('[')
+        separator = ''
+        while batch := list(itertools.islice(entries, BATCH_SIZE)):
+            f.write(separator)
+            f.write(', '.join(batch))
+            separator = ', '
+        f.write(']')